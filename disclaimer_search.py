@@ -0,0 +1,229 @@
+import difflib
+import re
+
+
+NO_TEXT_MARKER = "No text presented in the image"
+
+# Word stems specific to financial warnings, matched against the start of each word
+DISCLAIMER_STEMS = (
+    "risk", "capital", "invest", "guarante", "regulat", "authoris", "authoriz", "fca",
+    "warning", "disclaim", "lose", "loss", "repossess",
+)
+
+# Phrases specific to financial warnings, matched against the punctuation-free text
+DISCLAIMER_PHRASES = (
+    "past performance", "go down", "fall as well as rise", "get back less", "financial conduct authority",
+)
+
+
+def normalize_text(text):
+    """Lowercase the text and collapse whitespace so near-identical OCR outputs compare equal."""
+    return " ".join(str(text).lower().split())
+
+
+def texts_are_similar(text_a, text_b, similarity_threshold=0.85):
+    """Fuzzy comparison of two OCR texts using a sequence similarity ratio."""
+    norm_a, norm_b = normalize_text(text_a), normalize_text(text_b)
+    if norm_a == norm_b:
+        return True
+    # autojunk would discard common letters and spaces in long texts such as disclaimers
+    matcher = difflib.SequenceMatcher(None, norm_a, norm_b, autojunk=False)
+    # Cheap upper bounds on the ratio before running the full comparison
+    if matcher.real_quick_ratio() < similarity_threshold or matcher.quick_ratio() < similarity_threshold:
+        return False
+    return matcher.ratio() >= similarity_threshold
+
+
+def is_no_text(text):
+    """Check whether the OCR output is empty or the model's "no text" reply."""
+    return not text or not normalize_text(text) or texts_are_similar(text, NO_TEXT_MARKER)
+
+
+def looks_like_disclaimer(text, min_keywords=2):
+    """Cheap heuristic: the text contains at least `min_keywords` warning-specific stems or phrases."""
+    words = re.findall(r"\w+", str(text).lower())
+    joined = " ".join(words)
+    found = sum(1 for stem in DISCLAIMER_STEMS if any(word.startswith(stem) for word in words))
+    found += sum(1 for phrase in DISCLAIMER_PHRASES if f" {phrase} " in f" {joined} ")
+    return found >= min_keywords
+
+
+def cluster_texts(texts, similarity_threshold=0.85):
+    """Group fuzzy-duplicate texts together. Returns a list of clusters (lists of texts)."""
+    clusters = []
+    for text in texts:
+        for cluster in clusters:
+            if texts_are_similar(cluster[0], text, similarity_threshold):
+                cluster.append(text)
+                break
+        else:
+            clusters.append([text])
+    return clusters
+
+
+def cluster_representative(cluster):
+    """Pick the most frequent variant of a cluster (after normalization).
+
+    Ties are broken by the longest variant, then by the first one seen.
+    """
+    counts = {}
+    for text in cluster:
+        key = normalize_text(text)
+        counts[key] = counts.get(key, 0) + 1
+    best = cluster[0]
+    for text in cluster:
+        key, best_key = normalize_text(text), normalize_text(best)
+        if (counts[key], len(key)) > (counts[best_key], len(best_key)):
+            best = text
+    return best
+
+
+def deduplicate_texts(texts, similarity_threshold=0.85):
+    """Collapse fuzzy-duplicate OCR texts into one representative string per cluster.
+
+    Clusters are ordered by size (first seen on ties) so the most consistent texts come first.
+    """
+    clusters = cluster_texts(texts, similarity_threshold)
+    clusters.sort(key=len, reverse=True)
+    return [cluster_representative(cluster) for cluster in clusters]
+
+
+def edge_timestamps(duration_sec, edge_seconds=3):
+    """Opening and closing seconds of the video, interleaved so both edges are read early."""
+    last_sec = max(duration_sec - 0.5, 0)
+    timestamps = []
+    for t in range(0, int(edge_seconds) + 1):
+        for timestamp in (min(float(t), last_sec), max(last_sec - t, 0)):
+            timestamp = round(timestamp, 2)
+            if timestamp not in timestamps:
+                timestamps.append(timestamp)
+    return timestamps
+
+
+def coarse_timestamps(duration_sec, interval_seconds=5, edge_seconds=3):
+    """Build the coarse sampling schedule, opening and closing seconds first, then the middle."""
+    last_sec = max(duration_sec - 0.5, 0)
+    timestamps = edge_timestamps(duration_sec, edge_seconds)
+    t = float(interval_seconds)
+    while t < last_sec:
+        timestamp = round(t, 2)
+        if timestamp not in timestamps:
+            timestamps.append(timestamp)
+        t += interval_seconds
+    return timestamps
+
+
+def refine_timestamps(hit_timestamp, duration_sec, interval_seconds=5, refine_interval_seconds=1):
+    """Timestamps around a coarse hit, at `refine_interval_seconds` spacing, nearest first."""
+    last_sec = max(duration_sec - 0.5, 0)
+    timestamps = []
+    offset = refine_interval_seconds
+    while offset < interval_seconds:
+        for t in (hit_timestamp - offset, hit_timestamp + offset):
+            timestamp = round(t, 2)
+            if 0 <= timestamp <= last_sec and timestamp not in timestamps:
+                timestamps.append(timestamp)
+        offset += refine_interval_seconds
+    return timestamps
+
+
+def add_hit(clusters, timestamp_sec, text, similarity_threshold=0.85):
+    """Add an OCR hit to the first cluster it fuzzy-matches, or start a new cluster.
+
+    Each cluster is a dict with the "texts" and "timestamps" of its hits. Returns the cluster
+    the hit was added to, so callers only need to re-check that one.
+    """
+    for cluster in clusters:
+        if texts_are_similar(cluster["texts"][0], text, similarity_threshold):
+            break
+    else:
+        cluster = {"texts": [], "timestamps": []}
+        clusters.append(cluster)
+    cluster["texts"].append(text)
+    cluster["timestamps"].append(timestamp_sec)
+    return cluster
+
+
+def is_consistent_disclaimer(cluster, min_consistent_frames=3):
+    """Check whether a cluster is a disclaimer seen in at least `min_consistent_frames` distinct frames."""
+    return (len(set(cluster["timestamps"])) >= min_consistent_frames
+            and looks_like_disclaimer(cluster_representative(cluster["texts"])))
+
+
+def progressive_search(duration_sec, ocr, interval_seconds=5, edge_seconds=3, refine_interval_seconds=1,
+                       min_consistent_frames=3, similarity_threshold=0.85, max_refine_calls=10):
+    """Progressively sample a video of `duration_sec` seconds and collect the text found.
+
+    `ocr(timestamp_sec)` returns the text of the frame at that timestamp, or None. Frames are
+    first sampled coarsely, opening and closing seconds first, then refined only around
+    disclaimer-like hits, with at most `max_refine_calls` extra calls. Once both edges have
+    been read, sampling stops early when a disclaimer has been seen in `min_consistent_frames`
+    frames.
+    """
+    extracted_texts = []
+    clusters = []
+    processed_timestamps = set()
+    edges = set(edge_timestamps(duration_sec, edge_seconds))
+    consistent_clusters = []
+
+    def process_timestamp(timestamp_sec):
+        """OCR the frame at the given timestamp. Returns the text found, or None."""
+        processed_timestamps.add(timestamp_sec)
+        extracted_text = ocr(timestamp_sec)
+        if is_no_text(extracted_text):
+            return None
+        extracted_texts.append(extracted_text)
+        cluster = add_hit(clusters, timestamp_sec, extracted_text, similarity_threshold)
+        if is_consistent_disclaimer(cluster, min_consistent_frames):
+            consistent_clusters.append(cluster)
+        return extracted_text
+
+    def can_stop_early():
+        """Never stop before both the opening and closing seconds have been read."""
+        return bool(consistent_clusters) and edges <= processed_timestamps
+
+    # Coarse pass
+    disclaimer_hits = []
+    for timestamp_sec in coarse_timestamps(duration_sec, interval_seconds, edge_seconds):
+        extracted_text = process_timestamp(timestamp_sec)
+        if extracted_text and looks_like_disclaimer(extracted_text):
+            disclaimer_hits.append(timestamp_sec)
+        if can_stop_early():
+            print(f"Consistent disclaimer found in at least {min_consistent_frames} frames, stopping early")
+            return extracted_texts
+
+    # Refinement pass, only around disclaimer-like hits and within the call budget
+    refine_calls = 0
+    for hit_timestamp in disclaimer_hits:
+        for timestamp_sec in refine_timestamps(hit_timestamp, duration_sec, interval_seconds, refine_interval_seconds):
+            if timestamp_sec in processed_timestamps:
+                continue
+            if refine_calls >= max_refine_calls:
+                return extracted_texts
+            refine_calls += 1
+            process_timestamp(timestamp_sec)
+            if can_stop_early():
+                print(f"Consistent disclaimer found in at least {min_consistent_frames} frames, stopping early")
+                return extracted_texts
+
+    return extracted_texts
+
+
+def sample_sequentially(timed_frames, ocr_frame, interval_seconds=5):
+    """Extract the text of one frame every `interval_seconds` from `(timestamp_sec, frame)` pairs.
+
+    Used when the duration is unknown, so every frame has to be read until the end.
+    """
+    extracted_texts = []
+    next_sample_sec = 0.0
+    for timestamp_sec, frame in timed_frames:
+        if timestamp_sec < next_sample_sec:
+            continue
+        print(f"Processing frame at {timestamp_sec:.2f} seconds")
+        extracted_text = ocr_frame(frame)
+        if not is_no_text(extracted_text):
+            extracted_texts.append(extracted_text)
+        # Catch up if the timestamps jumped over several sampling points
+        while next_sample_sec <= timestamp_sec:
+            next_sample_sec += interval_seconds
+    return extracted_texts
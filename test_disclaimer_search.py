@@ -0,0 +1,162 @@
+from disclaimer_search import (
+    add_hit,
+    coarse_timestamps,
+    deduplicate_texts,
+    edge_timestamps,
+    is_consistent_disclaimer,
+    is_no_text,
+    looks_like_disclaimer,
+    progressive_search,
+    refine_timestamps,
+    sample_sequentially,
+    texts_are_similar,
+)
+
+
+DISCLAIMER = (
+    "Capital at risk. The value of investments and any income from them can fall as well as rise "
+    "and you may get back less than you invested. Past performance is not a reliable indicator of "
+    "future results. Tax treatment depends on your individual circumstances and may change in future."
+)
+# Typical OCR noise: l read as 1 and m read as rn
+NOISY_DISCLAIMER = DISCLAIMER.replace("l", "1").replace("m", "rn")
+
+
+def test_edge_timestamps_interleave_opening_and_closing():
+    assert edge_timestamps(30, edge_seconds=3) == [0.0, 29.5, 1.0, 28.5, 2.0, 27.5, 3.0, 26.5]
+
+
+def test_coarse_timestamps_edges_before_middle():
+    timestamps = coarse_timestamps(30, interval_seconds=5, edge_seconds=3)
+    assert timestamps[:8] == edge_timestamps(30, edge_seconds=3)
+    assert timestamps[8:] == [5.0, 10.0, 15.0, 20.0, 25.0]
+
+
+def test_coarse_timestamps_short_video_has_no_duplicates():
+    assert coarse_timestamps(0.4) == [0.0]
+    timestamps = coarse_timestamps(2)
+    assert timestamps == [0.0, 1.5, 1.0, 0.5]
+    assert len(timestamps) == len(set(timestamps))
+
+
+def test_refine_timestamps_nearest_first_within_video():
+    assert refine_timestamps(5, 30, interval_seconds=5) == [4, 6, 3, 7, 2, 8, 1, 9]
+    assert refine_timestamps(29.5, 30, interval_seconds=3) == [28.5, 27.5]
+    assert refine_timestamps(0.5, 30, interval_seconds=2, refine_interval_seconds=0.5) == [0.0, 1.0, 1.5, 2.0]
+
+
+def test_long_noisy_disclaimer_is_similar():
+    assert len(DISCLAIMER) > 200
+    assert texts_are_similar(DISCLAIMER, NOISY_DISCLAIMER)
+    assert deduplicate_texts([DISCLAIMER, NOISY_DISCLAIMER, DISCLAIMER]) == [DISCLAIMER]
+
+
+def test_deduplicate_texts_orders_clusters_by_size():
+    texts = ["BrandCo", "Capital at risk.", "capital at risk", "Capital at risk!"]
+    assert deduplicate_texts(texts) == ["Capital at risk.", "BrandCo"]
+
+
+def test_deduplicate_texts_tie_breaking():
+    # Whitespace and case variants count as the same variant
+    assert deduplicate_texts(["Capital at  risk", "capital at risk", "Capital at risk!"]) == ["Capital at  risk"]
+    # Equal counts: the longest variant wins
+    assert deduplicate_texts(["Capital at risk", "Capital at risk!"]) == ["Capital at risk!"]
+    # Equal counts and lengths: the first one seen wins
+    assert deduplicate_texts(["Capital at risk?", "Capital at risk!"]) == ["Capital at risk?"]
+
+
+def test_is_no_text_tolerates_punctuation():
+    assert is_no_text(None)
+    assert is_no_text("  ")
+    assert is_no_text("No text presented in the image.")
+    assert not is_no_text(DISCLAIMER)
+
+
+def test_looks_like_disclaimer_rejects_promotional_text():
+    assert not looks_like_disclaimer("Apply now for a loan today")
+    assert not looks_like_disclaimer("Great value, terms and conditions apply, guaranteed returns")
+    assert not looks_like_disclaimer("BrandCo")
+
+
+def test_looks_like_disclaimer_matches_stems_and_punctuation():
+    assert looks_like_disclaimer("Investments can go down. Capital at risk:")
+    assert looks_like_disclaimer("Your home may be repossessed. Authorised by the FCA.")
+    assert looks_like_disclaimer("Returns are not guaranteed (FCA)")
+    assert looks_like_disclaimer(DISCLAIMER)
+
+
+def test_add_hit_clusters_incrementally():
+    clusters = []
+    first = add_hit(clusters, 0.0, DISCLAIMER)
+    assert add_hit(clusters, 1.0, "BrandCo") is not first
+    assert add_hit(clusters, 2.0, NOISY_DISCLAIMER) is first
+    assert first["timestamps"] == [0.0, 2.0]
+    assert len(clusters) == 2
+
+
+def test_consistent_disclaimer_counts_distinct_frames():
+    cluster = {"texts": [DISCLAIMER, NOISY_DISCLAIMER], "timestamps": [28.5, 29.5]}
+    assert not is_consistent_disclaimer(cluster)
+    cluster["texts"].append(DISCLAIMER)
+    cluster["timestamps"].append(27.5)
+    assert is_consistent_disclaimer(cluster)
+    assert not is_consistent_disclaimer({"texts": ["BrandCo"] * 3, "timestamps": [0.0, 1.0, 2.0]})
+
+
+def make_ocr(text_at):
+    """Stub OCR returning `text_at(timestamp_sec)` and recording every call."""
+    calls = []
+
+    def ocr(timestamp_sec):
+        calls.append(timestamp_sec)
+        return text_at(timestamp_sec)
+
+    return ocr, calls
+
+
+def test_progressive_search_stops_on_closing_disclaimer():
+    ocr, calls = make_ocr(lambda t: "BrandCo" if t < 3 else DISCLAIMER if t >= 26 else None)
+    texts = progressive_search(30, ocr)
+    assert calls == edge_timestamps(30)
+    assert deduplicate_texts(texts) == [DISCLAIMER, "BrandCo"]
+
+
+def test_progressive_search_does_not_refine_around_logos_or_subtitles():
+    ocr, calls = make_ocr(lambda t: "BrandCo")
+    assert len(progressive_search(60, ocr)) == len(calls) == len(coarse_timestamps(60))
+
+    ocr, calls = make_ocr(lambda t: f"Subtitle line number {int(t)}")
+    progressive_search(120, ocr)
+    assert calls == coarse_timestamps(120)
+
+    ocr, calls = make_ocr(lambda t: "No text presented in the image.")
+    assert progressive_search(60, ocr) == []
+    assert calls == coarse_timestamps(60)
+
+
+def test_progressive_search_caps_refinement_calls():
+    # A disclaimer flashing at a single coarse timestamp is refined, within the budget
+    ocr, calls = make_ocr(lambda t: DISCLAIMER if t == 15.0 else None)
+    progressive_search(30, ocr, max_refine_calls=4)
+    coarse = coarse_timestamps(30)
+    assert calls[:len(coarse)] == coarse
+    assert calls[len(coarse):] == [14.0, 16.0, 13.0, 17.0]
+
+
+def test_progressive_search_reaches_disclaimer_behind_promotional_text():
+    ocr, calls = make_ocr(lambda t: DISCLAIMER if 20 <= t <= 25 else "Apply now for a loan today")
+    texts = progressive_search(120, ocr)
+    assert DISCLAIMER in texts
+    assert len(calls) <= len(coarse_timestamps(120)) + 10
+
+
+def test_sample_sequentially_reads_until_the_end():
+    frames = [(i / 25, i) for i in range(25 * 12)]
+    sampled = []
+
+    def ocr_frame(frame):
+        sampled.append(frame)
+        return "No text presented in the image" if frame == 0 else f"frame {frame}"
+
+    assert sample_sequentially(frames, ocr_frame, interval_seconds=5) == ["frame 125", "frame 250"]
+    assert sampled == [0, 125, 250]
@@ -9,6 +9,8 @@ import json
 from groq import Groq
 from dotenv import load_dotenv
 
+from disclaimer_search import deduplicate_texts, is_no_text, progressive_search, sample_sequentially
+
 
 # Load environment variables from a .env file
 
@@ -105,42 +107,75 @@ def process_frame(base64_image):
         return None
 
 
-def extract_and_process_frames(video_path, interval_seconds=5):
-    """Extract frames from the video and process each frame for text extraction."""
-    # Open the video file
-    video = cv2.VideoCapture(video_path)
-    
-    # Get the frames per second (fps) of the video
-    fps = video.get(cv2.CAP_PROP_FPS)
-    frame_count = 0
+# Frame rate assumed when neither the decoder nor the metadata report timestamps
+DEFAULT_FPS = 25
+
+
+def read_frame_at(video, timestamp_sec):
+    """Seek to the given timestamp and read a single frame. Returns None if the read fails."""
+    video.set(cv2.CAP_PROP_POS_MSEC, timestamp_sec * 1000)
     success, frame = video.read()
+    return frame if success else None
+
+
+def ocr_frame(frame):
+    """Extract the text of a single frame. Returns None when the frame holds no text."""
+    # Convert the frame to base64
+    base64_image = frame_to_base64(frame)
+    if not base64_image:
+        print("no base64_image")
+        return None
+
+    # Process the base64 image to extract text
+    extracted_text = process_frame(base64_image)
+    if is_no_text(extracted_text):
+        return None
+    print(f"Text from frame: {extracted_text}")
+    return extracted_text
+
 
-    # List to store all extracted texts
-    extracted_texts = []
+def read_timed_frames(video, fps):
+    """Read the video until EOF, yielding `(timestamp_sec, frame)` pairs."""
+    frame_index = 0
+    success, frame = video.read()
 
     while success:
-        # Calculate the current timestamp in seconds
-        current_time_sec = frame_count / fps
-        
-        # Extract frame every `interval_seconds`
-        if current_time_sec % interval_seconds == 0:
-            print(f"Processing frame at {int(current_time_sec)} seconds")
-            
-            # Convert the frame to base64
-            base64_image = frame_to_base64(frame)
-            
-            if base64_image:
-                # Process the base64 image to extract text
-                extracted_text = process_frame(base64_image)
-                if extracted_text:
-                    print(f"Text from frame: {extracted_text}")
-                    extracted_texts.append(extracted_text)  # Add the extracted text to the list
-            else:
-                print("no base64_image")
-            
-        # Read the next frame
+        # Prefer the decoder timestamp, the metadata fps can be missing or wrong
+        current_time_sec = video.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        if current_time_sec <= 0 and frame_index > 0:
+            current_time_sec = frame_index / (fps if fps and fps > 0 else DEFAULT_FPS)
+        yield current_time_sec, frame
+
         success, frame = video.read()
-        frame_count += 1
+        frame_index += 1
+
+
+def extract_and_process_frames(video_path, interval_seconds=5, edge_seconds=3, refine_interval_seconds=1,
+                               min_consistent_frames=3, similarity_threshold=0.85, max_refine_calls=10):
+    """Progressively sample frames and extract their text, see `progressive_search`."""
+    # Open the video file
+    video = cv2.VideoCapture(video_path)
+
+    # Get the video duration from its frame count and frames per second (fps)
+    fps = video.get(cv2.CAP_PROP_FPS)
+    frame_count = video.get(cv2.CAP_PROP_FRAME_COUNT)
+    if not fps or fps <= 0 or not frame_count or frame_count <= 0:
+        print(f"Warning: could not determine the video duration (fps={fps}, frame_count={frame_count}), "
+              f"falling back to a sequential read")
+        extracted_texts = sample_sequentially(read_timed_frames(video, fps), ocr_frame, interval_seconds)
+        video.release()
+        return extracted_texts
+
+    def ocr_at(timestamp_sec):
+        """Extract the text of the frame at the given timestamp."""
+        print(f"Processing frame at {timestamp_sec} seconds")
+        frame = read_frame_at(video, timestamp_sec)
+        return ocr_frame(frame) if frame is not None else None
+
+    extracted_texts = progressive_search(
+        frame_count / fps, ocr_at, interval_seconds, edge_seconds, refine_interval_seconds,
+        min_consistent_frames, similarity_threshold, max_refine_calls,
+    )
 
     # Release the video capture object
     video.release()
@@ -149,7 +184,10 @@ def extract_and_process_frames(video_path, interval_seconds=5):
     return extracted_texts
 
 
-def check_and_extract_disclaimer(extracted_texts):
+def check_and_extract_disclaimer(extracted_texts, similarity_threshold=0.85):
+    # Only send one representative string per cluster of near-identical texts
+    representative_texts = deduplicate_texts(extracted_texts, similarity_threshold)
+    print(f"Reduced {len(extracted_texts)} extracted texts to {len(representative_texts)} representative texts")
     system_message = """
         You are tasked with reviewing a list of texts to identify any disclaimer or warning messages.
         Multiple texts in the list may be similar. 
@@ -175,7 +213,7 @@ def check_and_extract_disclaimer(extracted_texts):
                 },
                 {
                     "role": "user",
-                    "content": f"This is the list that contains the extracted text: {extracted_texts}",
+                    "content": f"This is the list that contains the extracted text: {representative_texts}",
                 }
             ],
             model="llama-3.2-90b-text-preview",